@@ -1,21 +1,24 @@
 # Save this as eval.py
 import json
 import time
-from calculate_reimbursement import calculate_reimbursement
+try:
+    from orjson import loads as json_loads  # optional, several times faster
+except ImportError:
+    from json import loads as json_loads
+import numpy as np
+
+# Importing loads the forest and builds/loads the prediction caches – work
+# that used to happen inside the per-case loop, so it is timed too
+_import_start = time.time()
+from calculate_reimbursement import calculate_reimbursement_batch
+IMPORT_TIME = time.time() - _import_start
 
 def evaluate_model():
     # Load test cases
-    with open('public_cases.json', 'r') as f:
-        test_cases = json.load(f)
+    with open('public_cases.json', 'rb') as f:
+        test_cases = json_loads(f.read())
     
-    # Initialize counters
     total_cases = len(test_cases)
-    exact_matches = 0  # Within $0.01
-    close_matches = 0  # Within $1.00
-    total_error = 0
-    max_error = 0
-    max_error_case = None
-    errors = []
     
     print("🧾 Black Box Challenge - Reimbursement System Evaluation")
     print("=" * 55)
@@ -23,57 +26,31 @@ def evaluate_model():
     
     start_time = time.time()
     
-    # Process each test case
-    for i, case in enumerate(test_cases):
-        if i % 100 == 0:
-            print(f"Progress: {i}/{total_cases} cases processed...")
-        
-        # Extract inputs
-        trip_days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        # Calculate result
-        try:
-            predicted = calculate_reimbursement(trip_days, miles, receipts)
-            error = abs(predicted - expected)
-            
-            # Track metrics
-            total_error += error
-            
-            if error < 0.01:
-                exact_matches += 1
-            if error < 1.0:
-                close_matches += 1
-            
-            if error > max_error:
-                max_error = error
-                max_error_case = {
-                    'case_num': i,
-                    'trip_days': trip_days,
-                    'miles': miles,
-                    'receipts': receipts,
-                    'expected': expected,
-                    'predicted': predicted,
-                    'error': error
-                }
-            
-            # Store errors for analysis
-            errors.append({
-                'case_num': i,
-                'error': error,
-                'trip_days': trip_days,
-                'miles': miles,
-                'receipts': receipts,
-                'expected': expected,
-                'predicted': predicted,
-                'miles_per_day': miles / trip_days,
-                'receipts_per_day': receipts / trip_days
-            })
-            
-        except Exception as e:
-            print(f"Error on case {i}: {e}")
+    # Extract inputs as flat arrays
+    trip_days_arr = np.fromiter((c['input']['trip_duration_days'] for c in test_cases),
+                                dtype=np.float64, count=total_cases)   # keeps fractional days
+    miles_arr = np.fromiter((c['input']['miles_traveled'] for c in test_cases),
+                            dtype=np.float64, count=total_cases)
+    receipts_arr = np.fromiter((c['input']['total_receipts_amount'] for c in test_cases),
+                               dtype=np.float64, count=total_cases)
+    expected_arr = np.fromiter((c['expected_output'] for c in test_cases),
+                               dtype=np.float64, count=total_cases)
+
+    # Calculate all results in one batched call
+    predicted_arr = calculate_reimbursement_batch(trip_days_arr, miles_arr, receipts_arr)
+    err_arr = np.abs(predicted_arr - expected_arr)
+
+    # Failed cases come back as NaN – report and skip them
+    scored = np.flatnonzero(np.isfinite(predicted_arr))
+    for i in np.flatnonzero(~np.isfinite(predicted_arr)):
+        print(f"Error on case {i}: no result (got {predicted_arr[i]})")
+    scored_err = err_arr[scored]
+
+    # Track metrics
+    total_error = float(scored_err.sum())
+    exact_matches = int((scored_err < 0.01).sum())  # Within $0.01
+    close_matches = int((scored_err < 1.0).sum())   # Within $1.00
+    max_error = float(scored_err.max()) if scored.size else 0
     
     # Calculate results
     avg_error = total_error / total_cases
@@ -109,15 +86,18 @@ def evaluate_model():
     if exact_matches < total_cases:
         print("  Check these high-error cases:")
         
-        # Sort by error and show top 5
-        errors.sort(key=lambda x: x['error'], reverse=True)
-        for i, case in enumerate(errors[:5]):
-            print(f"    Case {case['case_num']}: {case['trip_days']} days, "
-                  f"{case['miles']:.0f} miles, ${case['receipts']:.2f} receipts")
-            print(f"      Expected: ${case['expected']:.2f}, Got: ${case['predicted']:.2f}, "
-                  f"Error: ${case['error']:.2f}")
+        # Top 5 by error – partition, then order just those five
+        k = min(5, scored.size)
+        worst = scored[np.argpartition(scored_err, -k)[-k:]] if k else scored
+        worst = worst[np.argsort(-err_arr[worst], kind='stable')]
+        for i in worst:
+            print(f"    Case {i}: {trip_days_arr[i]:g} days, "
+                  f"{miles_arr[i]:.0f} miles, ${receipts_arr[i]:.2f} receipts")
+            print(f"      Expected: ${expected_arr[i]:.2f}, Got: ${predicted_arr[i]:.2f}, "
+                  f"Error: ${err_arr[i]:.2f}")
     
-    print(f"\nExecution time: {time.time() - start_time:.2f} seconds")
+    print(f"\nExecution time: {time.time() - start_time + IMPORT_TIME:.2f} seconds "
+          f"(incl. {IMPORT_TIME:.2f}s loading the model and caches)")
     
     # Return detailed results for further analysis
     return {
@@ -126,12 +106,37 @@ def evaluate_model():
         'avg_error': avg_error,
         'max_error': max_error,
         'score': score,
-        'errors': errors
+        'cases': test_cases,
+        'predicted': predicted_arr,
+        'error': err_arr,
+        'scored': scored
     }
 
+def error_records(results):
+    """Per-case dicts for error_analysis.json, worst first (failed cases left out)."""
+    records = []
+    scored = results['scored']
+    for i in scored[np.argsort(-results['error'][scored], kind='stable')]:
+        inp = results['cases'][i]['input']
+        trip_days = inp['trip_duration_days']
+        miles = inp['miles_traveled']
+        receipts = inp['total_receipts_amount']
+        records.append({
+            'case_num': int(i),
+            'error': float(results['error'][i]),
+            'trip_days': trip_days,
+            'miles': miles,
+            'receipts': receipts,
+            'expected': results['cases'][i]['expected_output'],
+            'predicted': float(results['predicted'][i]),
+            'miles_per_day': miles / trip_days,
+            'receipts_per_day': receipts / trip_days
+        })
+    return records
+
 if __name__ == "__main__":
     results = evaluate_model()
     
     # Optional: Save error analysis for deeper investigation
     with open('error_analysis.json', 'w') as f:
-        json.dump(results['errors'], f, indent=2)
\ No newline at end of file
+        json.dump(error_records(results), f, indent=2)
\ No newline at end of file
@@ -3,44 +3,93 @@
 generate_results.py  –  Windows-friendly one-file solution
 ----------------------------------------------------------
 • Reads private_cases.json
-• Calls calculate_reimbursement.calculate_reimbursement(...)
+• Calls calculate_reimbursement.calculate_reimbursement_batch(...) on one
+  contiguous row chunk per core (a single chunk for small files); workers
+  are forked where possible so they share the parent's forest
 • Writes one numeric result per line to private_results.txt
 """
 
-import json, pathlib, sys, time
+import multiprocessing, os, pathlib, sys, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from joblib import Parallel, delayed
+
+PARALLEL_MIN = 20_000    # below this, worker start-up costs more than it saves
+FORK = "fork" in multiprocessing.get_all_start_methods()
+
+# numba's default TBB pool hangs the parent at exit once it has forked, and
+# OpenMP refuses to fork at all; the plain workqueue layer is fork-safe
+os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")
 
 # --- 1. load private cases ---------------------------------------------------
 CASES = pathlib.Path("private_cases.json")
 if not CASES.exists():
     sys.exit("private_cases.json not found!")
 
-with CASES.open("r", encoding="utf-8") as fh:
-    data = json.load(fh)
+try:
+    from orjson import loads as json_loads   # optional, several times faster
+except ImportError:
+    from json import loads as json_loads
+
+data = json_loads(CASES.read_bytes())
+n    = len(data)
+
+# straight into flat column arrays – no per-row intermediates
+days  = np.fromiter((c["trip_duration_days"] for c in data), dtype=np.float64, count=n)
+miles = np.fromiter((c["miles_traveled"] for c in data), dtype=np.float64, count=n)
+recs  = np.fromiter((c["total_receipts_amount"] for c in data), dtype=np.float64, count=n)
+del data
 
 # --- 2. import your reimbursement function ----------------------------------
 try:
-    from calculate_reimbursement import calculate_reimbursement as calc
+    from calculate_reimbursement import calculate_reimbursement_batch as calc_batch
 except ImportError as e:
     sys.exit("Cannot import calculate_reimbursement(): " + str(e))
 
 # --- 3. process & write results ---------------------------------------------
-out = pathlib.Path("private_results.txt").open("w", encoding="utf-8")
 start = time.time()
 
-for i, case in enumerate(data, 1):
-    if i % 100 == 0:
-        print(f"{i}/{len(data)} …")
-
-    days = case["trip_duration_days"]
-    miles = case["miles_traveled"]
-    recs  = case["total_receipts_amount"]
-
+def calc_chunk(days, miles, recs):
+    """calc_batch, but a failing chunk comes back as NaNs instead of raising."""
     try:
-        val = calc(days, miles, recs)
-        out.write(f"{val}\n")
+        return calc_batch(days, miles, recs)
     except Exception as ex:
-        print(f"Case {i} failed:", ex)
-        out.write("ERROR\n")
+        print(f"Chunk of {len(days)} cases failed:", ex)
+        return np.full(len(days), np.nan)
+
+def calc_range(lo, hi):
+    # forked workers inherit the case arrays and the mmapped forest from
+    # the parent, so only the two row bounds cross the process boundary
+    return calc_chunk(days[lo:hi], miles[lo:hi], recs[lo:hi])
+
+def calc_all(days, miles, recs):
+    n_chunks = os.cpu_count() or 1
+    if len(days) < PARALLEL_MIN or n_chunks == 1:
+        return calc_chunk(days, miles, recs)
+    # one contiguous slice per core keeps each worker's rows together
+    bounds = np.linspace(0, len(days), n_chunks + 1).astype(int)
+    if FORK:
+        ctx = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(n_chunks, mp_context=ctx) as pool:
+            parts = list(pool.map(calc_range, bounds[:-1], bounds[1:]))
+    else:
+        # Windows: no fork, so loky workers re-import the module and load
+        # the forest themselves (mmap_mode="r" keeps that cheap)
+        parts = Parallel(n_jobs=n_chunks, backend="loky")(
+            delayed(calc_chunk)(days[lo:hi], miles[lo:hi], recs[lo:hi])
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        )
+    return np.concatenate(parts)
+
+vals = calc_all(days, miles, recs)
+
+# format everything in one pass, then patch failed (non-finite) rows
+lines = np.char.mod("%.2f", vals).astype(object)
+bad   = ~np.isfinite(vals)
+lines[bad] = "ERROR"
+for i in np.flatnonzero(bad)[:10]:
+    print(f"Case {i + 1} failed")
+
+pathlib.Path("private_results.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
 
-out.close()
-print(f"\n✅  Done – wrote {i} lines to private_results.txt in {time.time()-start:0.1f}s")
+print(f"\n✅  Done – wrote {n} lines to private_results.txt in {time.time()-start:0.1f}s")
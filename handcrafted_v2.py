@@ -14,7 +14,7 @@ Everything else (fortnight parity, dynamic long‑trip penalty, etc.) is retaine
 from v1.1.
 """
 from __future__ import annotations
-import sys, math, json, statistics, pathlib
+import sys, math, json, statistics, pathlib, functools
 
 # ────────────────────────────────────────────────────────────
 # 1  Constants
@@ -49,24 +49,47 @@ C = {
     "BUG"         : 0.60,
 }
 
+# Flat module‑level copies of `C` – one global load per use instead of a
+# dict lookup on every call.
+BASE, LONG_K = C["BASE"], C["LONG_K"]
+M_LIMS  = (100.0, 300.0, 600.0, 1_000.0)
+M_DELTA = tuple(float(x) for x in C["M_DELTA"])
+R12_LOW, R12_HIGH, R12_KNEE = C["R12_LOW"], C["R12_HIGH"], C["R12_KNEE"]
+R36_LOW, R36_HIGH, R36_KNEE = C["R36_LOW"], C["R36_HIGH"], C["R36_KNEE"]
+R7_BASE, R7_SPILL, R7_KNEE_PD = C["R7_BASE"], C["R7_SPILL"], C["R7_KNEE_PD"]
+R7_P0, R7_P_S = C["R7_P0"], C["R7_P_S"]
+FIVE_BONUS, FIVE_CAP = C["FIVE_BONUS"], C["FIVE_CAP"]
+WEEK_BONUS, FORT_PEN = C["WEEK_BONUS"], C["FORT_PEN"]
+EFF_PEAK, EFF_WIDTH, EFF_BONUS = C["EFF_PEAK"], C["EFF_WIDTH"], C["EFF_BONUS"]
+ONE_DAY_WARRIOR_BONUS = C["ONE_DAY_WARRIOR_BONUS"]
+LMILE_CAP_PD, LMILE_PEN_RATE = C["LMILE_CAP_PD"], C["LMILE_PEN_RATE"]
+BUG = C["BUG"]
+# multiplier by receipt cents (0–99): BUG on .49/.99, 1.0 everywhere else
+BUG_MULT = tuple(BUG if c in (49,99) else 1.0 for c in range(100))
+# trip length is normally a small integer: long‑trip dampener for d = 0…63
+# and the ≤100‑mile delta for d = 0…7; any other d takes the formula
+LONG_FAC_LUT = tuple(1.0 if d<=7 else max(0.0,1-LONG_K*math.log(d-6)) for d in range(64))
+LOW_M_DELTA  = (-150.0, 0.0, -150.0, -150.0, -100.0, -100.0, -100.0, -50.0)
+
 # ────────────────────────────────────────────────────────────
 # 2  Helper functions
 # ────────────────────────────────────────────────────────────
 
 def long_fac(d:int)->float:                    # base dampener
-    return 1.0 if d<=7 else max(0.0,1-C["LONG_K"]*math.log(d-6))
+    if 0<=d<len(LONG_FAC_LUT) and d==int(d): return LONG_FAC_LUT[int(d)]
+    return 1.0 if d<=7 else max(0.0,1-LONG_K*math.log(d-6))
 
 
 def mile_delta(d:int,m:float)->float:          # mileage tiers
     if m<=100:
-        if d==1: return 0.0
+        if 0<=d<=7 and d==int(d): return LOW_M_DELTA[int(d)]
+        if d==1: return 0.0                     # fractional / out‑of‑table d
         if d<=3: return -150.0
         if d<=6: return -100.0
         return -50.0
-    lims=(100,300,600,1_000)
-    for lim,dl in zip(lims,C["M_DELTA"]):
-        if m<=lim: return dl
-    return C["M_DELTA"][-1]
+    for i in range(len(M_LIMS)):
+        if m<=M_LIMS[i]: return M_DELTA[i]
+    return M_DELTA[-1]
 
 
 def rec_1_6(d,rec,low,hi,knee_pd):             # receipts helper
@@ -75,70 +98,77 @@ def rec_1_6(d,rec,low,hi,knee_pd):             # receipts helper
 
 
 def rec_7_plus(d:int,rec:float)->float:        # long‑trip receipts
-    knee=C["R7_KNEE_PD"]*d
-    base=C["R7_BASE"]*min(rec,knee)
-    spill=C["R7_SPILL"]*max(0, min(rec-knee, knee))
-    pen_rate=C["R7_P0"]+C["R7_P_S"]*d
-    penalty=pen_rate*max(0,rec-2*knee)
+    knee=R7_KNEE_PD*d
+    base=R7_BASE*min(rec,knee)
+    spill=R7_SPILL*max(0.0, min(rec-knee, knee))
+    pen_rate=R7_P0+R7_P_S*d
+    penalty=pen_rate*max(0.0,rec-2*knee)
     return base+spill-penalty
 
 
 def rec_comp(d:int,rec:float)->float:
-    if d<=2: return rec_1_6(d,rec,C["R12_LOW"],C["R12_HIGH"],C["R12_KNEE"])
-    if d<=6: return rec_1_6(d,rec,C["R36_LOW"],C["R36_HIGH"],C["R36_KNEE"])
+    if d<=2: return rec_1_6(d,rec,R12_LOW,R12_HIGH,R12_KNEE)
+    if d<=6: return rec_1_6(d,rec,R36_LOW,R36_HIGH,R36_KNEE)
     return rec_7_plus(d,rec)
 
 
 def eff_bonus(d:int,m:float)->float:           # efficiency parabola
-    mpd=m/d; sc=1-((mpd-C["EFF_PEAK"])/C["EFF_WIDTH"])**2
-    peak=80 if d<=6 else C["EFF_BONUS"]
+    mpd=m/d; sc=1-((mpd-EFF_PEAK)/EFF_WIDTH)**2
+    peak=80.0 if d<=6 else EFF_BONUS
     val=sc*peak
-    return val if d>=7 else max(0,val)
+    return val if d>=7 else max(0.0,val)
 
 
 def fortnight_adj(d:int,rpd:float)->float:     # week‑parity rule
-    if 7<=d<=8 and 120<=rpd<=180: return C["WEEK_BONUS"]
-    if 13<=d<=14 and 150<=rpd<=200: return C["FORT_PEN"]
+    if 7<=d<=8 and 120<=rpd<=180: return WEEK_BONUS
+    if 13<=d<=14 and 150<=rpd<=200: return FORT_PEN
     return 0.0
 
 
 def low_mile_penalty(d:int,m:float,rec:float)->float:
-    """Claw back overspend on 3–4 day trips that barely drive."""
-    if d in (3,4) and m<=100:
-        cap=C["LMILE_CAP_PD"]*d
+    """Claw back overspend on 3–4 day trips that barely drive."""
+    if (d==3 or d==4) and m<=100:
+        cap=LMILE_CAP_PD*d
         excess=max(0.0, rec-cap)
-        return -C["LMILE_PEN_RATE"]*excess
+        return -LMILE_PEN_RATE*excess
     return 0.0
 
 
-def hits_bug(r:float)->bool: return int(round(r*100))%100 in (49,99)
+def bug_mult(r:float)->float:                  # table lookup, no compare/branch
+    return BUG_MULT[int(r*100+0.5)%100]
 
 # ────────────────────────────────────────────────────────────
 # 3  Main calculation
 # ────────────────────────────────────────────────────────────
 
-def calculate_reimbursement(d:int,m:float,r:float)->float:
-    total=(C["BASE"]*d*long_fac(d)+mile_delta(d,m)+rec_comp(d,r)+eff_bonus(d,m))
+def raw_total(d:int,m:float,r:float)->float:
+    """Unrounded reimbursement – the core of calculate_reimbursement."""
+    total=(BASE*d*long_fac(d)+mile_delta(d,m)+rec_comp(d,r)+eff_bonus(d,m))
 
     # 5‑day bonus + cap
     if d==5:
-        total=min(total+C["FIVE_BONUS"],C["FIVE_CAP"])
+        total=min(total+FIVE_BONUS,FIVE_CAP)
 
     # v1.2 one‑day road‑warrior credit
     if d==1 and m>500:
-        total+=C["ONE_DAY_WARRIOR_BONUS"]
+        total+=ONE_DAY_WARRIOR_BONUS
 
-    # v1.2 low‑mileage spend penalty (3‑4 d, ≤100 mi)
+    # v1.2 low‑mileage spend penalty (3‑4 d, ≤100 mi)
     total+=low_mile_penalty(d,m,r)
 
     # fortnight parity
     total+=fortnight_adj(d,r/d)
 
     # historic .49/.99 bug
-    if hits_bug(r):
-        total*=C["BUG"]
+    total*=bug_mult(r)
+
+    return total
+
+
+@functools.lru_cache(maxsize=None)           # repeated trips are free
+def calculate_reimbursement(d:int,m:float,r:float)->float:
+    return round(raw_total(d,m,r),2)
 
-    return round(total,2)
 
 # ────────────────────────────────────────────────────────────
 # 4  CLI entry
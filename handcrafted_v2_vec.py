@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Vectorised twin of handcrafted_v2 – same rules, NumPy arrays in and out.
+
+Every scalar helper from `handcrafted_v2` is re‑expressed with boolean masks,
+`np.where` and `np.select`, so a whole case file is scored in a handful of
+ufunc passes instead of one interpreted call per trip.  Constants are shared
+with the scalar module via `handcrafted_v2.C`; the two must stay in lock‑step.
+"""
+from __future__ import annotations
+import sys, json, math, pathlib
+import numpy as np
+
+import handcrafted_v2 as hc
+from handcrafted_v2 import C
+
+M_LIMS  = np.array((100, 300, 600, 1_000), dtype=np.float64)
+M_DELTA = np.array(C["M_DELTA"], dtype=np.float64)
+BUG_MULT = np.ones(100); BUG_MULT[[49,99]] = C["BUG"]   # indexed by receipt cents
+LONG_FAC_LUT = np.array(hc.LONG_FAC_LUT)   # indexed by integral d, 0…63
+LOW_M_DELTA  = np.array(hc.LOW_M_DELTA)    # indexed by integral d, 0…7
+
+def round2(a:np.ndarray)->np.ndarray:
+    """Builtin round(x, 2) per element – np.round breaks half‑cent ties
+    differently, and the scalar path / run.sh use the builtin."""
+    a=np.asarray(a, dtype=np.float64)
+    return np.array([round(x,2) for x in a.ravel().tolist()]).reshape(a.shape)
+
+# ────────────────────────────────────────────────────────────
+# 1  Helper functions (array versions)
+# ────────────────────────────────────────────────────────────
+
+def _table_index(d:np.ndarray,n:int)->np.ndarray:
+    """d clipped into a table of n entries; equals d only for integral 0≤d<n."""
+    return np.clip(np.nan_to_num(d, nan=-1.0),0,n-1).astype(np.int64)
+
+
+def long_fac(d:np.ndarray)->np.ndarray:
+    idx=_table_index(d,len(LONG_FAC_LUT))
+    out=LONG_FAC_LUT[idx]
+    odd=d!=idx                                   # fractional / past the table: rare
+    if np.any(odd):                              # math.log, exactly as the scalar path
+        out[odd]=[1.0 if x<=7 else max(0.0,1-C["LONG_K"]*math.log(x-6))
+                  for x in d[odd].tolist()]
+    return out
+
+
+def mile_delta(d:np.ndarray,m:np.ndarray)->np.ndarray:
+    low=m<=100
+    idx=_table_index(d,len(LOW_M_DELTA))
+    low_d=np.where(d==idx, LOW_M_DELTA[idx],
+                   np.select([d==1, d<=3, d<=6], [0.0,-150.0,-100.0], -50.0))
+    tier=np.searchsorted(M_LIMS, m, side="left")       # m<=lim → that tier
+    return np.where(low, low_d, M_DELTA[tier])
+
+
+def rec_1_6(d,rec,low,hi,knee_pd):
+    knee=knee_pd*d
+    return np.where(rec<=knee, low*rec, low*knee+hi*(rec-knee))
+
+
+def rec_7_plus(d:np.ndarray,rec:np.ndarray)->np.ndarray:
+    knee=C["R7_KNEE_PD"]*d
+    base=C["R7_BASE"]*np.minimum(rec,knee)
+    spill=C["R7_SPILL"]*np.maximum(0, np.minimum(rec-knee, knee))
+    pen_rate=C["R7_P0"]+C["R7_P_S"]*d
+    penalty=pen_rate*np.maximum(0,rec-2*knee)
+    return base+spill-penalty
+
+
+def rec_comp(d:np.ndarray,rec:np.ndarray)->np.ndarray:
+    return np.where(d<=2, rec_1_6(d,rec,C["R12_LOW"],C["R12_HIGH"],C["R12_KNEE"]),
+           np.where(d<=6, rec_1_6(d,rec,C["R36_LOW"],C["R36_HIGH"],C["R36_KNEE"]),
+                    rec_7_plus(d,rec)))
+
+
+def eff_bonus(d:np.ndarray,m:np.ndarray)->np.ndarray:
+    mpd=m/d; sc=1-((mpd-C["EFF_PEAK"])/C["EFF_WIDTH"])**2
+    peak=np.where(d<=6, 80.0, C["EFF_BONUS"])
+    val=sc*peak
+    return np.where(d>=7, val, np.maximum(0,val))
+
+
+def fortnight_adj(d:np.ndarray,rpd:np.ndarray)->np.ndarray:
+    return np.select([(7<=d)&(d<=8)&(120<=rpd)&(rpd<=180),
+                      (13<=d)&(d<=14)&(150<=rpd)&(rpd<=200)],
+                     [C["WEEK_BONUS"], C["FORT_PEN"]], 0.0)
+
+
+def low_mile_penalty(d:np.ndarray,m:np.ndarray,rec:np.ndarray)->np.ndarray:
+    excess=np.maximum(0.0, rec-C["LMILE_CAP_PD"]*d)
+    return np.where(((d==3)|(d==4))&(m<=100), -C["LMILE_PEN_RATE"]*excess, 0.0)
+
+
+def bug_mult(r:np.ndarray)->np.ndarray:
+    cents=(r*100+0.5).astype(np.int64)%100    # half‑up; receipts are whole cents
+    return BUG_MULT[cents]
+
+# ────────────────────────────────────────────────────────────
+# 2  Main calculation
+# ────────────────────────────────────────────────────────────
+
+def calc_vec(d,m,r)->np.ndarray:
+    """Array version of `handcrafted_v2.calculate_reimbursement`."""
+    d=np.asarray(d, dtype=np.float64)           # fractional days follow the formula
+    m=np.asarray(m, dtype=np.float64)
+    r=np.asarray(r, dtype=np.float64)
+
+    total=(C["BASE"]*d*long_fac(d)+mile_delta(d,m)+rec_comp(d,r)+eff_bonus(d,m))
+
+    # 5‑day bonus + cap
+    total=np.where(d==5, np.minimum(total+C["FIVE_BONUS"],C["FIVE_CAP"]), total)
+
+    # one‑day road‑warrior credit
+    total=np.where((d==1)&(m>500), total+C["ONE_DAY_WARRIOR_BONUS"], total)
+
+    # low‑mileage spend penalty (3‑4 d, ≤100 mi)
+    total+=low_mile_penalty(d,m,r)
+
+    # fortnight parity
+    total+=fortnight_adj(d,r/d)
+
+    # historic .49/.99 bug
+    total*=bug_mult(r)
+
+    return round2(total)
+
+# ────────────────────────────────────────────────────────────
+# 3  CLI entry
+# ────────────────────────────────────────────────────────────
+if __name__=="__main__":
+    if len(sys.argv)==2:
+        rows=json.loads(pathlib.Path(sys.argv[1]).read_text())[1:]
+        d=np.array([c["input"]["trip_duration_days"] for c in rows])
+        m=np.array([c["input"]["miles_traveled"] for c in rows], dtype=float)
+        r=np.array([c["input"]["total_receipts_amount"] for c in rows], dtype=float)
+        y=np.array([c["expected_output"] for c in rows])
+        errs=np.abs(calc_vec(d,m,r)-y)
+        print(f"MAE {errs.mean():.2f}  Max {errs.max():.2f}")
+    else:
+        print("Usage: handcrafted_v2_vec.py public_cases.json")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+rf_flat.py
+
+A fitted RandomForestRegressor copied into flat, contiguous node tables
+(one row per tree, padded to the largest tree) plus a numba kernel that
+walks every tree for every input row.
+
+    feature   (T, n_nodes) int16    split feature, < 0 for leaves
+    threshold (T, n_nodes) float64  go left when x[feature] <= threshold
+    left      (T, n_nodes) int32    child indices
+    right     (T, n_nodes) int32
+    value     (T, n_nodes) float64  leaf means
+
+Thresholds and values keep sklearn's float64 so results match
+forest.predict() bit for bit; rows are cast to float32 first, exactly
+as sklearn does.
+
+box_bounds() walks the same tables to bound what the forest can predict
+anywhere inside an axis-aligned box of inputs.
+
+Requires numba; `NUMBA` is False when it is not installed and callers
+should stay on forest.predict().  numba itself is only imported, and the
+kernels compiled, on the first predict()/box_bounds() call, so importing
+this module costs a one-shot CLI run nothing.
+"""
+
+import importlib.util
+import numpy as np
+
+NUMBA = importlib.util.find_spec("numba") is not None
+prange = range          # numba.prange once _compile() has run
+_compiled = False
+
+def _compile() -> None:
+    """Import numba and jit the kernels (loaded from numba's cache after the first run)."""
+    global prange, _predict, _box_bounds, _compiled
+    if _compiled:
+        return
+    from numba import njit, prange
+    _predict    = njit(cache=True, parallel=True)(_predict)
+    _box_bounds = njit(cache=True, parallel=True)(_box_bounds)
+    _compiled = True
+
+# --------------------------------------------------------------------------
+# 1. forest → SoA arrays
+# --------------------------------------------------------------------------
+def flatten_forest(forest) -> tuple:
+    trees   = [est.tree_ for est in forest.estimators_]
+    n_nodes = max(t.node_count for t in trees)
+    shape   = (len(trees), n_nodes)
+
+    feature   = np.full(shape, -2, dtype=np.int16)
+    threshold = np.zeros(shape, dtype=np.float64)
+    left      = np.zeros(shape, dtype=np.int32)
+    right     = np.zeros(shape, dtype=np.int32)
+    value     = np.zeros(shape, dtype=np.float64)
+
+    for i, t in enumerate(trees):
+        n = t.node_count
+        feature[i, :n]   = t.feature
+        threshold[i, :n] = t.threshold
+        left[i, :n]      = t.children_left
+        right[i, :n]     = t.children_right
+        value[i, :n]     = t.value[:, 0, 0]
+
+    return feature, threshold, left, right, value
+
+# --------------------------------------------------------------------------
+# 2. traversal kernel
+# --------------------------------------------------------------------------
+BLOCK = 256   # rows per task; one tree's nodes stay cache-hot across a block
+
+def _predict(feature, threshold, left, right, value, X):
+    n_rows, n_trees = X.shape[0], feature.shape[0]
+    out = np.zeros(n_rows)
+    for b in prange((n_rows + BLOCK - 1) // BLOCK):
+        lo, hi = b * BLOCK, min((b + 1) * BLOCK, n_rows)
+        for t in range(n_trees):
+            for i in range(lo, hi):
+                node = 0
+                while feature[t, node] >= 0:
+                    if X[i, feature[t, node]] <= threshold[t, node]:
+                        node = left[t, node]
+                    else:
+                        node = right[t, node]
+                out[i] += value[t, node]
+    return out / n_trees
+
+def predict(flat: tuple, X) -> np.ndarray:
+    """Mean prediction over all trees for each row of X (N, n_features)."""
+    _compile()
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    return _predict(*flat, X)
+
+# --------------------------------------------------------------------------
+# 3. prediction bounds over input boxes
+# --------------------------------------------------------------------------
+def _box_bounds(feature, threshold, left, right, value, lo, hi):
+    n_boxes, n_trees = lo.shape[0], feature.shape[0]
+    out = np.zeros((n_boxes, 2))
+    for b in prange(n_boxes):
+        stack = np.empty(feature.shape[1], dtype=np.int32)
+        for t in range(n_trees):
+            vmin, vmax = np.inf, -np.inf
+            stack[0], top = 0, 1
+            while top > 0:
+                top -= 1
+                node = stack[top]
+                j = feature[t, node]
+                if j < 0:
+                    vmin = min(vmin, value[t, node])
+                    vmax = max(vmax, value[t, node])
+                    continue
+                if lo[b, j] <= threshold[t, node]:
+                    stack[top] = left[t, node]; top += 1
+                if hi[b, j] > threshold[t, node]:
+                    stack[top] = right[t, node]; top += 1
+            out[b, 0] += vmin
+            out[b, 1] += vmax
+    return out / n_trees
+
+def box_bounds(flat: tuple, lo, hi) -> np.ndarray:
+    """(min, max) forest prediction for any row with lo <= x <= hi, per box.
+
+    Each tree contributes its smallest and largest reachable leaf, so the
+    forest mean can never leave the returned interval.  lo/hi are (B,
+    n_features) and cast to float32 like the rows they stand for.
+    """
+    _compile()
+    lo = np.ascontiguousarray(lo, dtype=np.float32)
+    hi = np.ascontiguousarray(hi, dtype=np.float32)
+    return _box_bounds(*flat, lo, hi)
@@ -17,7 +17,6 @@ import joblib
 import pathlib
 import numpy as np
 import pandas as pd
-from collections import defaultdict
 from sklearn.tree import export_text
 
 # --------------------------------------------------------------------------
@@ -71,31 +70,36 @@ print(export_text(best_tree, feature_names=list(X.columns), max_depth=4))
 MIN_SUPPORT = int(0.01 * len(df))   # ≥1% of rows  (==10 for 1,000 rows)
 rules = []
 
-for tree in rf.estimators_:
-    leaf_ids = tree.apply(X)
-    group = defaultdict(list)
-    for row_idx, leaf_id in enumerate(leaf_ids):
-        group[leaf_id].append(row_idx)
-
-    for leaf_id, rows_idx in group.items():
-        if len(rows_idx) < MIN_SUPPORT:
-            continue   # ignore tiny leaves
+y_np = y.to_numpy()
+X_np = X.to_numpy(dtype=np.float32)   # trees compare features as float32
+names = list(X.columns)
 
-        row_sample = df.iloc[rows_idx]
-        median_pred = np.median(y.iloc[rows_idx])
-
-        # path to leaf
-        path_nodes = tree.decision_path(X.iloc[[rows_idx[0]]]).indices
+for tree in rf.estimators_:
+    leaf_ids = tree.apply(X_np)
+    t = tree.tree_
+    feature, threshold = t.feature, t.threshold
+    left, right = t.children_left, t.children_right
+    # group rows by leaf without Python dicts: a stable sort makes each
+    # leaf's rows one contiguous run of `order`, in original row order
+    order = np.argsort(leaf_ids, kind="stable")
+    leaves, starts, counts = np.unique(leaf_ids[order],
+                                       return_index=True, return_counts=True)
+    keep = counts >= MIN_SUPPORT          # ignore tiny leaves
+
+    for leaf_id, start, n_rows in zip(leaves[keep], starts[keep], counts[keep]):
+        rows_idx = order[start:start + n_rows]
+        median_pred = np.median(y_np[rows_idx])
+
+        # path to leaf: walk the node arrays with one sample from the leaf
+        row = X_np[rows_idx[0]]
         terms = []
-        for node_id in path_nodes:
-            if tree.tree_.feature[node_id] == -2:   # leaf
-                continue
-            fname  = X.columns[tree.tree_.feature[node_id]]
-            thresh = tree.tree_.threshold[node_id]
-            # direction for this sample
-            go_left = X.iloc[rows_idx[0], tree.tree_.feature[node_id]] <= thresh
+        node = 0
+        while feature[node] != -2:                  # -2 marks a leaf
+            thresh = threshold[node]
+            go_left = row[feature[node]] <= thresh
             sign = "<=" if go_left else ">"
-            terms.append(f"{fname} {sign} {thresh:.1f}")
+            terms.append(f"{names[feature[node]]} {sign} {thresh:.1f}")
+            node = left[node] if go_left else right[node]
 
         rule_txt = " and ".join(terms)
         rules.append((len(rows_idx), median_pred, rule_txt))
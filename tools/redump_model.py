@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+redump_model.py
+
+Re-save the trained forest uncompressed so it can be opened with
+joblib.load(..., mmap_mode="r").
+
+Compressed joblib files have to be inflated into each process's heap;
+uncompressed ones let the tree arrays be memory-mapped and shared by the
+page cache across worker processes.
+
+Usage
+-----
+python tools/redump_model.py [model.pkl]
+"""
+
+import pathlib
+import sys
+import joblib
+
+MODEL_FILE = pathlib.Path(__file__).resolve().parent.parent / "rf_reimbursement.pkl"
+
+def main() -> None:
+    path = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else MODEL_FILE
+    rf = joblib.load(path)
+    joblib.dump(rf, path, compress=0)
+    print(f"Model re-saved uncompressed → {path}")
+
+if __name__ == "__main__":
+    main()